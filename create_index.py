@@ -2,17 +2,115 @@
 """Generate a beautiful HTML homepage for the QGIS plugin repository."""
 
 import os
-import configparser
+import argparse
+import hashlib
+import json
+import re
+import string
 from zipfile import ZipFile
 from datetime import datetime
 import shutil
+import threading
+from html import escape as html_escape
+from xml.sax.saxutils import escape as xml_escape
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 PLUGINS_DIR = "plugins"
 ICONS_DIR = "icons"
+METADATA_CACHE_FILE = ".metadata_cache.json"
+# Bump whenever metadata parsing changes, so cached results are re-parsed
+METADATA_CACHE_VERSION = 2
+ICON_HASHES_FILE = ".icon_hashes.json"
+BUILD_FINGERPRINT_FILE = ".build_fingerprint"
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Section headers and "key = value" / "key: value" lines in metadata.txt
+_SECTION_RE = re.compile(rb"^\[([^\]\n]+)\]", re.M)
+_KV_RE = re.compile(rb"([^:=]+?)\s*[:=]\s*(.*)")
+
+# Substrings marking images in an icons dir that are not the main plugin icon
+_ICON_SKIP = ("about", "settings", "logo")
+
+# Parsed metadata keyed by (zip_path, st_mtime_ns, st_size)
+_METADATA_CACHE: dict = {}
+_METADATA_CACHE_LOCK = threading.Lock()
+_PRINT_LOCK = threading.Lock()
+
+# BLAKE2b digests of extracted icons keyed by icon filename
+_ICON_HASHES: dict = {}
+_ICON_HASHES_LOCK = threading.Lock()
+
+
+def _log(*args, **kwargs):
+    """Print from worker threads without interleaving lines."""
+    with _PRINT_LOCK:
+        print(*args, **kwargs)
+
+
+def _open_zip(zip_path: str) -> tuple:
+    """Open a plugin zip and list its members once.
+
+    Returns:
+        A (zip_file, names, name_set) tuple: the open ZipFile, its member
+        names in archive order for scanning, and a frozenset of the same
+        names for O(1) membership tests.
+    """
+    zf = ZipFile(zip_path, "r")
+    names = zf.namelist()
+    return zf, names, frozenset(names)
+
+
+def _fresh_icon_path(
+    zip_path: str,
+    plugin_name: str,
+    metadata_icon_path: str = None,
+    zip_stat: os.stat_result = None,
+) -> str:
+    """Return the previously extracted icon if it is newer than the plugin zip.
+
+    Args:
+        zip_path: Path to the plugin zip file
+        plugin_name: Name of the plugin
+        metadata_icon_path: Icon path specified in metadata.txt (optional)
+        zip_stat: Result of os.stat() on the zip, if already known (optional)
+    """
+    if metadata_icon_path:
+        extensions = [os.path.splitext(metadata_icon_path)[1] or ".png"]
+    else:
+        extensions = [".png", ".svg"]
+
+    if zip_stat is None:
+        try:
+            zip_stat = os.stat(zip_path)
+        except OSError:
+            return None
+    zip_mtime = zip_stat.st_mtime
+
+    # Both a .png and a .svg may be left over from different plugin versions;
+    # the most recently extracted one is the current icon. An icon with the
+    # same mtime as the zip (e.g. both written by a fresh checkout) is not
+    # trusted and goes through the hash check in _write_icon instead.
+    newest = None
+    newest_mtime = zip_mtime
+    for extension in extensions:
+        icon_filename = f"{plugin_name}{extension}"
+        output_path = os.path.join(ICONS_DIR, icon_filename)
+        try:
+            icon_mtime = os.path.getmtime(output_path)
+        except OSError:
+            continue
+        if icon_mtime > newest_mtime:
+            newest = icon_filename
+            newest_mtime = icon_mtime
+    return f"{ICONS_DIR}/{newest}" if newest else None
 
 
 def extract_plugin_icon(
-    zip_path: str, plugin_name: str, metadata_icon_path: str = None
+    zip_path: str,
+    plugin_name: str,
+    metadata_icon_path: str = None,
+    force: bool = False,
 ) -> str:
     """Extract the plugin icon from the zip file and save it to the icons directory.
 
@@ -20,228 +118,538 @@ def extract_plugin_icon(
         zip_path: Path to the plugin zip file
         plugin_name: Name of the plugin
         metadata_icon_path: Icon path specified in metadata.txt (optional)
+        force: Re-extract even if the existing icon is newer than the zip
     """
-    # Create icons directory if it doesn't exist
-    os.makedirs(ICONS_DIR, exist_ok=True)
+    if not force:
+        icon_path = _fresh_icon_path(zip_path, plugin_name, metadata_icon_path)
+        if icon_path:
+            return icon_path
 
     try:
-        with ZipFile(zip_path, "r") as zf:
-            # Priority 1: Try the icon path from metadata.txt first
-            if metadata_icon_path:
-                # The metadata icon path might be relative to the plugin directory
-                metadata_icon_candidates = [
-                    f"{plugin_name}/{metadata_icon_path}",  # Relative to plugin dir
-                    metadata_icon_path,  # Absolute path in zip
-                ]
-
-                for icon_path in metadata_icon_candidates:
-                    if icon_path in zf.namelist():
-                        # Determine extension from the file
-                        extension = os.path.splitext(icon_path)[1]
-                        if not extension:
-                            extension = ".png"  # Default to PNG if no extension
-
-                        icon_filename = f"{plugin_name}{extension}"
-                        output_path = os.path.join(ICONS_DIR, icon_filename)
-
-                        with zf.open(icon_path) as icon_file:
-                            with open(output_path, "wb") as out_file:
-                                out_file.write(icon_file.read())
-
-                        print(
-                            f"✓ Extracted icon for {plugin_name} from metadata path: {icon_path}"
-                        )
-                        return f"{ICONS_DIR}/{icon_filename}"
-
-            # Priority 2: Find the icon file using standard locations
-            # Priority order: icon.png/svg, then plugin_name.png/svg
-            icon_candidates = [
-                (f"{plugin_name}/icons/icon.png", ".png"),
-                (f"{plugin_name}/icon.png", ".png"),
-                (f"{plugin_name}/icons/{plugin_name}.png", ".png"),
-                (f"{plugin_name}/icons/icon.svg", ".svg"),
-                (f"{plugin_name}/icon.svg", ".svg"),
-                (f"{plugin_name}/icons/{plugin_name}.svg", ".svg"),
-            ]
+        # Create icons directory if it doesn't exist
+        os.makedirs(ICONS_DIR, exist_ok=True)
+        zf, names, name_set = _open_zip(zip_path)
+        with zf:
+            return _extract_icon_from(
+                zf, name_set, names, plugin_name, metadata_icon_path
+            )
+    except Exception as e:
+        _log(f"⚠ Could not extract icon for {plugin_name}: {e}")
 
-            for icon_path, extension in icon_candidates:
-                if icon_path in zf.namelist():
-                    # Extract icon to icons directory
-                    icon_filename = f"{plugin_name}{extension}"
-                    output_path = os.path.join(ICONS_DIR, icon_filename)
+    return None
 
-                    with zf.open(icon_path) as icon_file:
-                        with open(output_path, "wb") as out_file:
-                            out_file.write(icon_file.read())
 
-                    print(f"✓ Extracted icon for {plugin_name}")
-                    return f"{ICONS_DIR}/{icon_filename}"
+def _extract_icon_from(
+    zf: ZipFile,
+    name_set: frozenset,
+    names: list,
+    plugin_name: str,
+    metadata_icon_path: str = None,
+) -> str:
+    """Extract the plugin icon from an already-open zip file.
+
+    The icons directory must already exist (scan_plugins creates it once).
 
-            # If no standard icon found, look for plugin-specific named icons
-            # For example: opera.svg for nasa_opera plugin
-            plugin_base_name = plugin_name.replace("_", "").replace("-", "")
-            for name in zf.namelist():
-                if name.endswith("icon.png") or name.endswith("/icon.png"):
-                    icon_filename = f"{plugin_name}.png"
-                    output_path = os.path.join(ICONS_DIR, icon_filename)
+    Args:
+        zf: The open plugin zip file
+        name_set: Set of member names in the zip, for membership tests
+        names: Member names in archive order, for scanning
+        plugin_name: Name of the plugin
+        metadata_icon_path: Icon path specified in metadata.txt (optional)
+    """
+    try:
+        # Priority 1: Try the icon path from metadata.txt first
+        if metadata_icon_path:
+            # The metadata icon path might be relative to the plugin directory
+            metadata_icon_candidates = [
+                f"{plugin_name}/{metadata_icon_path}",  # Relative to plugin dir
+                metadata_icon_path,  # Absolute path in zip
+            ]
 
-                    with zf.open(name) as icon_file:
-                        with open(output_path, "wb") as out_file:
-                            out_file.write(icon_file.read())
+            for icon_path in metadata_icon_candidates:
+                if icon_path in name_set:
+                    # Determine extension from the file
+                    extension = os.path.splitext(icon_path)[1]
+                    if not extension:
+                        extension = ".png"  # Default to PNG if no extension
 
-                    print(f"✓ Extracted icon for {plugin_name}")
+                    icon_filename = f"{plugin_name}{extension}"
+                    if _write_icon(zf, icon_path, icon_filename):
+                        _log(
+                            f"✓ Extracted icon for {plugin_name} from metadata path: {icon_path}"
+                        )
+                    else:
+                        _log(f"✓ Icon for {plugin_name} is unchanged")
                     return f"{ICONS_DIR}/{icon_filename}"
-                elif name.endswith("icon.svg") or name.endswith("/icon.svg"):
-                    icon_filename = f"{plugin_name}.svg"
-                    output_path = os.path.join(ICONS_DIR, icon_filename)
 
-                    with zf.open(name) as icon_file:
-                        with open(output_path, "wb") as out_file:
-                            out_file.write(icon_file.read())
+        # Priority 2: Find the icon file using standard locations
+        # Priority order: icon.png/svg, then plugin_name.png/svg
+        icon_candidates = [
+            f"{plugin_name}/icons/icon.png",
+            f"{plugin_name}/icon.png",
+            f"{plugin_name}/icons/{plugin_name}.png",
+            f"{plugin_name}/icons/icon.svg",
+            f"{plugin_name}/icon.svg",
+            f"{plugin_name}/icons/{plugin_name}.svg",
+        ]
+        candidate_rank = {path: rank for rank, path in enumerate(icon_candidates)}
+
+        # Fallback priority classes, after the standard candidates:
+        # any icon.png, any icon.svg, then any other PNG/SVG in an icons dir
+        icon_png, icon_svg, icons_dir = range(
+            len(icon_candidates), len(icon_candidates) + 3
+        )
 
-                    print(f"✓ Extracted icon for {plugin_name}")
-                    return f"{ICONS_DIR}/{icon_filename}"
-                # Look for any SVG/PNG file in icons directory that might be the main icon
-                elif "/icons/" in name and (
-                    name.endswith(".svg") or name.endswith(".png")
-                ):
+        # Classify every entry in a single pass over the archive, keeping the
+        # first hit for each priority
+        by_priority = [None] * (icons_dir + 1)
+        for name in names:
+            rank = candidate_rank.get(name)
+            if rank is None:
+                if name.endswith("icon.png"):
+                    rank = icon_png
+                elif name.endswith("icon.svg"):
+                    rank = icon_svg
+                elif "/icons/" in name and name.endswith((".svg", ".png")):
                     # Skip common non-icon files
-                    if any(
-                        skip in name.lower() for skip in ["about", "settings", "logo"]
-                    ):
+                    if any(skip in name.lower() for skip in _ICON_SKIP):
                         continue
-                    # Extract the first viable icon we find
-                    extension = ".svg" if name.endswith(".svg") else ".png"
-                    icon_filename = f"{plugin_name}{extension}"
-                    output_path = os.path.join(ICONS_DIR, icon_filename)
-
-                    with zf.open(name) as icon_file:
-                        with open(output_path, "wb") as out_file:
-                            out_file.write(icon_file.read())
-
-                    print(f"✓ Extracted icon for {plugin_name} from {name}")
-                    return f"{ICONS_DIR}/{icon_filename}"
+                    rank = icons_dir
+                else:
+                    continue
+            if by_priority[rank] is None:
+                by_priority[rank] = name
+
+        for rank, name in enumerate(by_priority):
+            if name is None:
+                continue
+            # Extract icon to icons directory
+            extension = ".svg" if name.endswith(".svg") else ".png"
+            icon_filename = f"{plugin_name}{extension}"
+            if not _write_icon(zf, name, icon_filename):
+                _log(f"✓ Icon for {plugin_name} is unchanged")
+            elif rank == icons_dir:
+                _log(f"✓ Extracted icon for {plugin_name} from {name}")
+            else:
+                _log(f"✓ Extracted icon for {plugin_name}")
+            return f"{ICONS_DIR}/{icon_filename}"
 
     except Exception as e:
-        print(f"⚠ Could not extract icon for {plugin_name}: {e}")
+        _log(f"⚠ Could not extract icon for {plugin_name}: {e}")
 
     return None
 
 
-def parse_metadata(zip_path: str) -> dict:
-    """Extract metadata from a QGIS plugin zip file."""
+def _write_icon(zf: ZipFile, member: str, icon_filename: str) -> bool:
+    """Write an icon from the zip into the icons directory if its content changed.
+
+    The icon's BLAKE2b digest is compared with the one recorded for the
+    previous extraction, and the file is only rewritten on a mismatch.
+
+    Args:
+        zf: The open plugin zip file
+        member: Path of the icon inside the zip
+        icon_filename: File name to write inside the icons directory
+
+    Returns:
+        True if the icon file was written, False if it was already up to date.
+    """
+    icon_bytes = zf.read(member)
+    digest = hashlib.blake2b(icon_bytes, digest_size=16).hexdigest()
+    output_path = os.path.join(ICONS_DIR, icon_filename)
+
+    if _ICON_HASHES.get(icon_filename) == digest and os.path.exists(output_path):
+        # Mark the icon as fresh again, so _fresh_icon_path can skip this zip
+        # on the next run instead of re-reading and re-hashing the icon
+        try:
+            os.utime(output_path)
+        except OSError:
+            pass
+        return False
+
+    with open(output_path, "wb") as out_file:
+        out_file.write(icon_bytes)
+    with _ICON_HASHES_LOCK:
+        _ICON_HASHES[icon_filename] = digest
+    return True
+
+
+def load_icon_hashes(hashes_file: str = ICON_HASHES_FILE):
+    """Load the digests of previously extracted icons from the JSON sidecar file."""
+    try:
+        with open(hashes_file, "r", encoding="utf-8") as f:
+            hashes = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    if isinstance(hashes, dict):
+        _ICON_HASHES.update(hashes)
+
+
+def save_icon_hashes(hashes_file: str = ICON_HASHES_FILE, plugin_names=None):
+    """Persist the digests of extracted icons to the JSON sidecar file.
+
+    Args:
+        hashes_file: Path of the JSON sidecar file
+        plugin_names: If given, only icons of these plugins are kept, so
+            plugins removed from the repository drop out of the file
+    """
+    hashes = _ICON_HASHES
+    if plugin_names is not None:
+        plugin_names = set(plugin_names)
+        hashes = {
+            icon_filename: digest
+            for icon_filename, digest in hashes.items()
+            if os.path.splitext(icon_filename)[0] in plugin_names
+        }
+    try:
+        with open(hashes_file, "w", encoding="utf-8") as f:
+            json.dump(hashes, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print(f"⚠ Could not write icon hashes {hashes_file}: {e}")
+
+
+def load_metadata_cache(cache_file: str = METADATA_CACHE_FILE):
+    """Load previously parsed metadata from the JSON sidecar file."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    # Caches from another parser version (or the older unversioned list
+    # format) are discarded rather than trusted
+    if not isinstance(cache, dict) or cache.get("version") != METADATA_CACHE_VERSION:
+        return
+
+    for entry in cache.get("entries", []):
+        try:
+            metadata = dict(entry["metadata"])
+            if "_metadata_date" in metadata:
+                metadata["_metadata_date"] = datetime.fromisoformat(
+                    metadata["_metadata_date"]
+                )
+            key = (entry["zip_path"], entry["mtime_ns"], entry["size"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        _METADATA_CACHE[key] = metadata
+
+
+def save_metadata_cache(cache_file: str = METADATA_CACHE_FILE, zip_paths=None):
+    """Persist the parsed metadata cache to the JSON sidecar file.
+
+    Args:
+        cache_file: Path of the JSON sidecar file
+        zip_paths: If given, only entries for these zips are kept, so zips
+            removed from the plugins directory drop out of the cache
+    """
+    if zip_paths is not None:
+        zip_paths = set(zip_paths)
+    entries = []
+    for (zip_path, mtime_ns, size), metadata in sorted(_METADATA_CACHE.items()):
+        if zip_paths is not None and zip_path not in zip_paths:
+            continue
+        metadata = dict(metadata)
+        if "_metadata_date" in metadata:
+            metadata["_metadata_date"] = metadata["_metadata_date"].isoformat()
+        entries.append(
+            {
+                "zip_path": zip_path,
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "metadata": metadata,
+            }
+        )
+
+    try:
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": METADATA_CACHE_VERSION, "entries": entries}, f, indent=1
+            )
+    except OSError as e:
+        print(f"⚠ Could not write metadata cache {cache_file}: {e}")
+
+
+def parse_metadata(
+    zip_path: str,
+    zf: ZipFile = None,
+    names: list = None,
+    zip_stat: os.stat_result = None,
+) -> dict:
+    """Extract metadata from a QGIS plugin zip file.
+
+    Results are cached by the zip's path, modification time and size, so
+    unchanged zips are only parsed once per run (and not at all when the
+    cache was loaded from a previous run).
+
+    Args:
+        zip_path: Path to the plugin zip file
+        zf: The zip file, if the caller already has it open (optional)
+        names: Member names of ``zf``, if already listed (optional)
+        zip_stat: Result of os.stat() on the zip, if already known (optional)
+    """
+    if zip_stat is None:
+        try:
+            zip_stat = os.stat(zip_path)
+        except OSError as e:
+            _log(f"Error reading {zip_path}: {e}")
+            return {}
+
+    key = (zip_path, zip_stat.st_mtime_ns, zip_stat.st_size)
+    cached = _METADATA_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    if zf is None:
+        try:
+            with ZipFile(zip_path, "r") as zf:
+                metadata = _parse_metadata_from(zf, zf.namelist())
+        except Exception as e:
+            _log(f"Error reading {zip_path}: {e}")
+            return {}
+    else:
+        metadata = _parse_metadata_from(zf, zf.namelist() if names is None else names)
+    if metadata:
+        with _METADATA_CACHE_LOCK:
+            # Drop stale entries for the same zip before caching the new one
+            for stale in [k for k in _METADATA_CACHE if k[0] == zip_path]:
+                del _METADATA_CACHE[stale]
+            _METADATA_CACHE[key] = dict(metadata)
+    return metadata
+
+
+def _parse_general_section(content: bytes) -> dict:
+    """Parse the [general] section of a metadata.txt file.
+
+    A lightweight stand-in for configparser that mirrors how it reads QGIS
+    metadata: keys are lowercased, indented lines continue the previous
+    value (blank lines inside a value are kept), and full-line ``#``/``;``
+    comments are skipped. Interpolation is not supported.
+
+    The file is scanned as raw bytes; only the extracted keys and values
+    are decoded as UTF-8.
+
+    Returns:
+        A dict of the section's options, or None if there is no [general]
+        section.
+    """
+    headers = list(_SECTION_RE.finditer(content))
+    for i, header in enumerate(headers):
+        if header.group(1) == b"general":
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            section = content[header.end() : end]
+            break
+    else:
+        return None
+
+    values = {}
+    key = None
+    indent = 0
+    for line in section.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if key is not None:
+                values[key].append(b"")
+            continue
+        if stripped.startswith((b"#", b";")):
+            continue
+
+        line_indent = len(line) - len(line.lstrip())
+        if key is not None and line_indent > indent:
+            # Continuation of a multiline value
+            values[key].append(stripped)
+            continue
+
+        indent = line_indent
+        match = _KV_RE.match(stripped)
+        if match is None:
+            key = None
+            continue
+        key = match.group(1).decode("utf-8").lower()
+        values[key] = [match.group(2)]
+
+    return {k: b"\n".join(v).rstrip().decode("utf-8") for k, v in values.items()}
+
+
+def _parse_metadata_from(zf: ZipFile, names: list) -> dict:
+    """Read and parse metadata.txt from an already-open plugin zip file."""
     metadata = {}
     try:
-        with ZipFile(zip_path, "r") as zf:
-            # Find metadata.txt in the zip
-            for name in zf.namelist():
-                if name.endswith("metadata.txt"):
-                    # Get the modification time of metadata.txt from the zip
-                    info = zf.getinfo(name)
-                    # date_time is a tuple: (year, month, day, hour, minute, second)
-                    metadata_date = datetime(*info.date_time)
-
-                    with zf.open(name) as f:
-                        content = f.read().decode("utf-8")
-                        config = configparser.ConfigParser()
-                        config.read_string(content)
-                        if "general" in config:
-                            metadata = dict(config["general"])
-                            # Store the metadata.txt modification date
-                            metadata["_metadata_date"] = metadata_date
-                    break
+        # QGIS plugins ship metadata.txt at <plugin_name>/metadata.txt, so try
+        # that entry directly before scanning the whole central directory
+        plugin_name = os.path.splitext(os.path.basename(zf.filename or ""))[0]
+        try:
+            info = zf.getinfo(f"{plugin_name}/metadata.txt")
+        except KeyError:
+            info = next(
+                (zf.getinfo(name) for name in names if name.endswith("metadata.txt")),
+                None,
+            )
+
+        if info is not None:
+            # date_time is a tuple: (year, month, day, hour, minute, second)
+            metadata_date = datetime(*info.date_time)
+
+            general = _parse_general_section(zf.read(info))
+            if general is not None:
+                metadata = general
+                # Store the metadata.txt modification date
+                metadata["_metadata_date"] = metadata_date
     except Exception as e:
-        print(f"Error reading {zip_path}: {e}")
+        _log(f"Error reading {zf.filename}: {e}")
     return metadata
 
 
-def get_file_size(path: str) -> str:
-    """Get human-readable file size."""
-    size = os.path.getsize(path)
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size < 1024:
-            return f"{size:.1f} {unit}"
-        size /= 1024
-    return f"{size:.1f} TB"
-
-
-def generate_index_html(output_file: str = "index.html"):
-    """Generate a modern HTML homepage for the plugin repository."""
-
-    # Find all plugin zip files in the plugins directory
-    plugins = []
-    plugins_path = PLUGINS_DIR
-    if os.path.isdir(plugins_path):
-        for filename in sorted(os.listdir(plugins_path)):
-            if filename.endswith(".zip"):
-                zip_path = os.path.join(plugins_path, filename)
-                metadata = parse_metadata(zip_path)
-                if metadata:
-                    # Get plugin name from filename (remove .zip extension)
-                    plugin_name = filename.replace(".zip", "")
-
-                    # Extract plugin icon using the path from metadata.txt if available
-                    metadata_icon = metadata.get("icon", None)
-                    icon_path = extract_plugin_icon(
-                        zip_path, plugin_name, metadata_icon
-                    )
-                    metadata["icon_path"] = icon_path
-
-                    # Store relative path from root for download links
-                    metadata["filename"] = f"{PLUGINS_DIR}/{filename}"
-                    metadata["filesize"] = get_file_size(zip_path)
-                    # Use the metadata.txt modification date from inside the zip
-                    if "_metadata_date" in metadata:
-                        metadata["modified"] = metadata["_metadata_date"].strftime(
-                            "%Y-%m-%d"
-                        )
-                    else:
-                        # Fallback to zip file modification time
-                        metadata["modified"] = datetime.fromtimestamp(
-                            os.path.getmtime(zip_path)
-                        ).strftime("%Y-%m-%d")
-                    plugins.append(metadata)
+def get_file_size(size: int) -> str:
+    """Get human-readable file size from a size in bytes."""
+    units = ("B", "KB", "MB", "GB", "TB")
+    # Each unit is 2**10 times the previous one, so the bit length picks it
+    i = min(max(size.bit_length() - 1, 0) // 10, len(units) - 1)
+    return f"{size / (1 << (10 * i)):.1f} {units[i]}"
+
+
+def _cached_metadata(zip_path: str, zip_stat: os.stat_result) -> dict:
+    """Return a copy of the cached metadata for an unchanged zip, or None."""
+    key = (zip_path, zip_stat.st_mtime_ns, zip_stat.st_size)
+    cached = _METADATA_CACHE.get(key)
+    return dict(cached) if cached is not None else None
+
+
+def _process_one_zip(
+    zip_path: str, zip_stat: os.stat_result, force: bool = False
+) -> dict:
+    """Collect metadata, icon, size and date information for one plugin zip.
+
+    The zip is opened at most once, and not at all when its metadata is
+    cached and its icon has already been extracted.
+
+    Args:
+        zip_path: Path to the plugin zip file
+        zip_stat: Result of os.stat() on the zip, reused for cache keys,
+            freshness checks, size and date
+        force: Re-extract the icon even if the existing one is up to date
+
+    Returns:
+        The plugin metadata dict, or None if the zip has no usable metadata.
+    """
+    filename = os.path.basename(zip_path)
+    # Get plugin name from filename (remove .zip extension)
+    plugin_name = filename.replace(".zip", "")
+
+    zf = None
+    try:
+        metadata = _cached_metadata(zip_path, zip_stat)
+        if metadata is None:
+            # Share the open zip and its central directory listing between
+            # metadata parsing and icon extraction
+            zf, names, name_set = _open_zip(zip_path)
+            metadata = parse_metadata(zip_path, zf, names, zip_stat)
+        if not metadata:
+            return None
+
+        # Extract plugin icon using the path from metadata.txt if available
+        metadata_icon = metadata.get("icon", None)
+        icon_path = None
+        if not force:
+            icon_path = _fresh_icon_path(zip_path, plugin_name, metadata_icon, zip_stat)
+        if icon_path is None:
+            if zf is None:
+                zf, names, name_set = _open_zip(zip_path)
+            icon_path = _extract_icon_from(
+                zf, name_set, names, plugin_name, metadata_icon
+            )
+        metadata["icon_path"] = icon_path
+    except Exception as e:
+        _log(f"Error reading {zip_path}: {e}")
+        return None
+    finally:
+        if zf is not None:
+            zf.close()
+
+    # Store relative path from root for download links
+    metadata["filename"] = f"{PLUGINS_DIR}/{filename}"
+    metadata["filesize"] = get_file_size(zip_stat.st_size)
+    # Use the metadata.txt modification date from inside the zip
+    if "_metadata_date" in metadata:
+        metadata["modified"] = metadata["_metadata_date"].strftime("%Y-%m-%d")
+    else:
+        # Fallback to zip file modification time
+        metadata["modified"] = datetime.fromtimestamp(zip_stat.st_mtime).strftime(
+            "%Y-%m-%d"
+        )
+
+    # Just the filename for the file_name tag in plugins.xml
+    metadata["zip_filename"] = filename
+    # Full path for download_url in plugins.xml
+    metadata["zip_path"] = f"{PLUGINS_DIR}/{filename}"
+    return metadata
+
+
+def list_plugin_zips() -> list:
+    """List the plugin zips in the plugins directory.
+
+    Returns:
+        os.DirEntry objects for every .zip file, sorted by file name. Their
+        cached stat results are reused by scan_plugins and _fingerprint.
+    """
+    if not os.path.isdir(PLUGINS_DIR):
+        return []
+    with os.scandir(PLUGINS_DIR) as it:
+        return sorted(
+            (entry for entry in it if entry.name.endswith(".zip")),
+            key=lambda entry: entry.name,
+        )
+
+
+def scan_plugins(force: bool = False, entries: list = None) -> list:
+    """Scan the plugins directory once and collect metadata for every plugin zip.
+
+    Zips are processed concurrently in a thread pool; zlib decompression
+    releases the GIL, so reading several zips at once overlaps I/O and
+    inflate work.
+
+    Args:
+        force: Re-extract icons even if the existing ones are up to date
+        entries: Plugin zips as returned by list_plugin_zips() (optional)
+
+    Returns:
+        A list of metadata dicts sorted by plugin name (case-insensitive),
+        shared by generate_plugins_xml and generate_index_html.
+    """
+    if entries is None:
+        entries = list_plugin_zips()
+    if not entries:
+        return []
+    # scandir entries carry their stat results, so each zip is stat'ed once
+    # and the result reused downstream
+    zip_paths = [entry.path for entry in entries]
+    zip_stats = [entry.stat() for entry in entries]
+
+    # Create icons directory once, rather than once per extracted icon
+    os.makedirs(ICONS_DIR, exist_ok=True)
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(partial(_process_one_zip, force=force), zip_paths, zip_stats)
+        )
+
+    plugins = [metadata for metadata in results if metadata]
 
     # Sort plugins alphabetically by name (case-insensitive)
     plugins.sort(key=lambda p: p.get("name", "").lower())
+    return plugins
 
-    # Generate plugin cards HTML
-    plugin_cards = ""
-    for p in plugins:
-        name = p.get("name", p["filename"])
-        version = p.get("version", "Unknown")
-        description = p.get("description", "No description available.")
-        author = p.get("author", "Unknown")
-        homepage = p.get("homepage", "#")
-        tracker = p.get("tracker", "#")
-        repository = p.get("repository", "#")
-        qgis_min = p.get("qgisminimumversion", "3.0")
-        experimental = p.get("experimental", "False").lower() == "true"
-        tags = p.get("tags", "")
-        category = p.get("category", "Plugins")
-
-        # Create tag badges
-        tag_badges = ""
-        if tags:
-            for tag in tags.split(",")[:5]:  # Limit to 5 tags
-                tag = tag.strip()
-                if tag:
-                    tag_badges += f'<span class="tag">{tag}</span>'
-
-        experimental_badge = (
-            '<span class="badge experimental">Experimental</span>'
-            if experimental
-            else ""
-        )
 
-        # Generate icon HTML if available
-        icon_html = ""
-        if p.get("icon_path"):
-            icon_html = (
-                f'<img src="{p["icon_path"]}" alt="{name} icon" class="plugin-icon">'
-            )
+# Static shell of the homepage, with ${plugin_cards} and ${plugin_count}
+# placeholders; read once at import and split around the cards so the page
+# can be streamed to disk
+with open(os.path.join(TEMPLATES_DIR, "index.html.tmpl"), "r", encoding="utf-8") as _f:
+    _INDEX_HEAD, _INDEX_TAIL = _f.read().split("${plugin_cards}")
+_INDEX_HEAD_TMPL = string.Template(_INDEX_HEAD)
 
-        plugin_cards += f"""
+# Markup for a single plugin card on the homepage
+_CARD_TMPL = """
         <div class="plugin-card">
             <div class="plugin-header">
                 <div class="plugin-title-row">
@@ -258,12 +666,12 @@ def generate_index_html(output_file: str = "index.html"):
             <div class="tags">{tag_badges}</div>
             <div class="meta">
                 <span>👤 {author}</span>
-                <span>📦 {p['filesize']}</span>
+                <span>📦 {filesize}</span>
                 <span>🔧 QGIS {qgis_min}+</span>
-                <span>📅 {p['modified']}</span>
+                <span>📅 {modified}</span>
             </div>
             <div class="actions">
-                <a href="{p['filename']}" class="btn btn-primary">⬇️ Download</a>
+                <a href="{filename}" class="btn btn-primary">⬇️ Download</a>
                 <a href="{homepage}" class="btn btn-secondary" target="_blank">🏠 Homepage</a>
                 <a href="{repository}" class="btn btn-secondary" target="_blank">📂 Repository</a>
                 <a href="{tracker}" class="btn btn-secondary" target="_blank">🐛 Issues</a>
@@ -271,528 +679,90 @@ def generate_index_html(output_file: str = "index.html"):
         </div>
         """
 
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>QGIS Plugin Repository | GeoAI Tools</title>
-    <link rel="icon" type="image/png" href="logo.png">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;600&family=Plus+Jakarta+Sans:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        :root {{
-            --bg-primary: #0f1419;
-            --bg-secondary: #1a1f26;
-            --bg-card: #1e252e;
-            --bg-hover: #252d38;
-            --text-primary: #e7eaed;
-            --text-secondary: #8b949e;
-            --accent-primary: #58a6ff;
-            --accent-secondary: #3fb950;
-            --accent-warning: #d29922;
-            --accent-purple: #a371f7;
-            --border-color: #30363d;
-            --shadow: 0 8px 32px rgba(0, 0, 0, 0.4);
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Plus Jakarta Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            line-height: 1.6;
-            min-height: 100vh;
-        }}
-
-        /* Geometric background pattern */
-        body::before {{
-            content: '';
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background:
-                radial-gradient(ellipse at 20% 20%, rgba(88, 166, 255, 0.08) 0%, transparent 50%),
-                radial-gradient(ellipse at 80% 80%, rgba(163, 113, 247, 0.06) 0%, transparent 50%),
-                radial-gradient(ellipse at 50% 50%, rgba(63, 185, 80, 0.04) 0%, transparent 60%);
-            pointer-events: none;
-            z-index: -1;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 2rem;
-        }}
-
-        header {{
-            text-align: center;
-            padding: 4rem 2rem;
-            background: linear-gradient(135deg, var(--bg-secondary) 0%, var(--bg-primary) 100%);
-            border-bottom: 1px solid var(--border-color);
-            position: relative;
-            overflow: hidden;
-        }}
-
-        header::after {{
-            content: '';
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            height: 1px;
-            background: linear-gradient(90deg, transparent, var(--accent-primary), transparent);
-        }}
-
-        .logo {{
-            width: 120px;
-            height: 120px;
-            margin: 0 auto 1rem;
-            display: block;
-        }}
-
-        h1 {{
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin-bottom: 0.5rem;
-            background: linear-gradient(135deg, var(--text-primary) 0%, var(--accent-primary) 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-
-        .subtitle {{
-            color: var(--text-secondary);
-            font-size: 1.1rem;
-            max-width: 600px;
-            margin: 0 auto 2rem;
-        }}
-
-        .repo-url {{
-            display: inline-flex;
-            align-items: center;
-            gap: 0.75rem;
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            padding: 1rem 1.5rem;
-            font-family: 'JetBrains Mono', monospace;
-            font-size: 0.95rem;
-            color: var(--accent-primary);
-            transition: all 0.3s ease;
-        }}
-
-        .repo-url:hover {{
-            border-color: var(--accent-primary);
-            box-shadow: 0 0 20px rgba(88, 166, 255, 0.15);
-        }}
-
-        .copy-btn {{
-            background: var(--accent-primary);
-            color: var(--bg-primary);
-            border: none;
-            padding: 0.5rem 1rem;
-            border-radius: 6px;
-            cursor: pointer;
-            font-weight: 600;
-            font-size: 0.85rem;
-            transition: all 0.2s ease;
-        }}
-
-        .copy-btn:hover {{
-            transform: scale(1.05);
-            box-shadow: 0 4px 12px rgba(88, 166, 255, 0.3);
-        }}
-
-        .instructions {{
-            margin-top: 2rem;
-            padding: 1.5rem;
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            max-width: 600px;
-            margin-left: auto;
-            margin-right: auto;
-            text-align: left;
-        }}
-
-        .instructions h3 {{
-            color: var(--accent-secondary);
-            margin-bottom: 1rem;
-            font-size: 1rem;
-        }}
-
-        .instructions ol {{
-            color: var(--text-secondary);
-            padding-left: 1.5rem;
-            font-size: 0.9rem;
-        }}
-
-        .instructions li {{
-            margin-bottom: 0.5rem;
-        }}
-
-        .plugins-section {{
-            padding: 3rem 0;
-        }}
-
-        .section-header {{
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            margin-bottom: 2rem;
-            flex-wrap: wrap;
-            gap: 1rem;
-        }}
-
-        .section-header h2 {{
-            font-size: 1.75rem;
-            font-weight: 600;
-        }}
-
-        .plugin-count {{
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-
-        .plugins-grid {{
-            display: grid;
-            gap: 1.5rem;
-        }}
-
-        .plugin-card {{
-            background: var(--bg-card);
-            border: 1px solid var(--border-color);
-            border-radius: 16px;
-            padding: 1.75rem;
-            transition: all 0.3s ease;
-        }}
-
-        .plugin-card:hover {{
-            border-color: var(--accent-primary);
-            transform: translateY(-2px);
-            box-shadow: var(--shadow);
-        }}
-
-        .plugin-header {{
-            display: flex;
-            align-items: flex-start;
-            justify-content: space-between;
-            margin-bottom: 1rem;
-            flex-wrap: wrap;
-            gap: 0.75rem;
-        }}
-
-        .plugin-title-row {{
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-        }}
-
-        .plugin-icon {{
-            width: 48px;
-            height: 48px;
-            object-fit: contain;
-            border-radius: 8px;
-            background: var(--bg-hover);
-            padding: 4px;
-        }}
-
-        .plugin-header h2 {{
-            font-size: 1.5rem;
-            font-weight: 600;
-            color: var(--text-primary);
-        }}
-
-        .badges {{
-            display: flex;
-            gap: 0.5rem;
-            flex-wrap: wrap;
-        }}
-
-        .badge {{
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-
-        .badge.version {{
-            background: rgba(88, 166, 255, 0.15);
-            color: var(--accent-primary);
-        }}
-
-        .badge.category {{
-            background: rgba(163, 113, 247, 0.15);
-            color: var(--accent-purple);
-        }}
-
-        .badge.experimental {{
-            background: rgba(210, 153, 34, 0.15);
-            color: var(--accent-warning);
-        }}
-
-        .description {{
-            color: var(--text-secondary);
-            margin-bottom: 1rem;
-            line-height: 1.7;
-        }}
-
-        .tags {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.5rem;
-            margin-bottom: 1rem;
-        }}
-
-        .tag {{
-            background: var(--bg-hover);
-            color: var(--text-secondary);
-            padding: 0.25rem 0.6rem;
-            border-radius: 6px;
-            font-size: 0.8rem;
-        }}
-
-        .meta {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 1.5rem;
-            margin-bottom: 1.25rem;
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-
-        .actions {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.75rem;
-        }}
-
-        .btn {{
-            display: inline-flex;
-            align-items: center;
-            gap: 0.5rem;
-            padding: 0.65rem 1.25rem;
-            border-radius: 8px;
-            font-size: 0.9rem;
-            font-weight: 500;
-            text-decoration: none;
-            transition: all 0.2s ease;
-        }}
-
-        .btn-primary {{
-            background: var(--accent-primary);
-            color: var(--bg-primary);
-        }}
-
-        .btn-primary:hover {{
-            box-shadow: 0 4px 16px rgba(88, 166, 255, 0.35);
-            transform: translateY(-1px);
-        }}
-
-        .btn-secondary {{
-            background: var(--bg-hover);
-            color: var(--text-primary);
-            border: 1px solid var(--border-color);
-        }}
-
-        .btn-secondary:hover {{
-            border-color: var(--text-secondary);
-            background: var(--bg-secondary);
-        }}
-
-        footer {{
-            text-align: center;
-            padding: 2rem;
-            border-top: 1px solid var(--border-color);
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-
-        footer a {{
-            color: var(--accent-primary);
-            text-decoration: none;
-        }}
-
-        footer a:hover {{
-            text-decoration: underline;
-        }}
-
-        @media (max-width: 768px) {{
-            .container {{
-                padding: 1rem;
-            }}
-
-            header {{
-                padding: 2rem 1rem;
-            }}
-
-            h1 {{
-                font-size: 1.75rem;
-            }}
-
-            .repo-url {{
-                flex-direction: column;
-                text-align: center;
-                font-size: 0.85rem;
-            }}
-
-            .plugin-header {{
-                flex-direction: column;
-            }}
-
-            .meta {{
-                gap: 1rem;
-            }}
-
-            .actions {{
-                flex-direction: column;
-            }}
-
-            .btn {{
-                justify-content: center;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <header>
-        <img src="logo.png" alt="QGIS Plugin Repository Logo" class="logo">
-        <h1>QGIS Plugin Repository</h1>
-        <p class="subtitle">AI-powered geospatial analysis tools for QGIS. Deep learning, hyperspectral analysis, and advanced segmentation.</p>
-        <div class="repo-url">
-            <span>https://qgis.gishub.org/plugins.xml</span>
-            <button class="copy-btn" onclick="copyUrl()">Copy URL</button>
-        </div>
-        <div class="instructions">
-            <h3>⚡ Quick Install (Recommended)</h3>
-            <p style="color: var(--text-secondary); margin-bottom: 1rem;">Install all plugins with a single command:</p>
-            <div style="background: var(--bg-hover); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem;">
-                <strong style="color: var(--accent-secondary); display: block; margin-bottom: 0.5rem;">Linux/macOS:</strong>
-                <code style="font-family: 'JetBrains Mono', monospace; color: var(--accent-primary); display: block; word-break: break-all;">curl -LsSf https://qgis.gishub.org/install.sh | bash</code>
-            </div>
-            <div style="background: var(--bg-hover); padding: 0.75rem; border-radius: 8px; margin-bottom: 0.75rem;">
-                <strong style="color: var(--accent-secondary); display: block; margin-bottom: 0.5rem;">Windows (PowerShell):</strong>
-                <code style="font-family: 'JetBrains Mono', monospace; color: var(--accent-primary); display: block; word-break: break-all;">powershell -ExecutionPolicy ByPass -c "irm https://qgis.gishub.org/install.ps1 | iex"</code>
-            </div>
-            <p style="color: var(--text-secondary); font-size: 0.85rem; margin-top: 0.75rem;">After installation, restart QGIS and enable plugins from: <strong>Plugins → Manage and Install Plugins → Installed</strong></p>
-        </div>
-        <div class="instructions" style="margin-top: 1.5rem;">
-            <h3>📋 Or Add This Repository Manually</h3>
-            <ol>
-                <li>Open QGIS → <strong>Plugins</strong> → <strong>Manage and Install Plugins</strong></li>
-                <li>Go to the <strong>Settings</strong> tab</li>
-                <li>Click <strong>Add...</strong> under "Plugin Repositories"</li>
-                <li>Paste the URL above and click OK</li>
-                <li>Enable <strong>"Show also experimental plugins"</strong></li>
-            </ol>
-        </div>
-    </header>
 
-    <main class="container">
-        <section class="plugins-section">
-            <div class="section-header">
-                <h2>📦 Available Plugins</h2>
-                <span class="plugin-count">{len(plugins)} plugins available</span>
-            </div>
-            <div class="plugins-grid">
-                {plugin_cards}
-            </div>
-        </section>
-    </main>
-
-    <footer>
-        <p>
-            Made with ❤️ by <a href="https://github.com/giswqs" target="_blank">Qiusheng Wu</a> |
-            <a href="https://github.com/opengeos/qgis-plugins" target="_blank">Open Geospatial Solutions</a>
-        </p>
-    </footer>
-
-    <script>
-        function copyUrl() {{
-            navigator.clipboard.writeText('https://qgis.gishub.org/plugins.xml');
-            const btn = document.querySelector('.copy-btn');
-            const originalText = btn.textContent;
-            btn.textContent = 'Copied!';
-            btn.style.background = '#3fb950';
-            setTimeout(() => {{
-                btn.textContent = originalText;
-                btn.style.background = '';
-            }}, 2000);
-        }}
-    </script>
-</body>
-</html>
-"""
+def _render_card(p: dict) -> str:
+    """Render the homepage card for one plugin."""
+    name = html_escape(p.get("name", p["filename"]))
+    version = html_escape(p.get("version", "Unknown"))
+    description = html_escape(p.get("description", "No description available."))
+    author = html_escape(p.get("author", "Unknown"))
+    homepage = html_escape(p.get("homepage", "#"))
+    tracker = html_escape(p.get("tracker", "#"))
+    repository = html_escape(p.get("repository", "#"))
+    qgis_min = html_escape(p.get("qgisminimumversion", "3.0"))
+    experimental = p.get("experimental", "False").lower() == "true"
+    tags = p.get("tags", "")
+    category = html_escape(p.get("category", "Plugins"))
+
+    # Create tag badges
+    tag_badges = "".join(
+        f'<span class="tag">{html_escape(tag)}</span>'
+        for tag in (t.strip() for t in tags.split(",")[:5])  # Limit to 5 tags
+        if tag
+    )
+
+    experimental_badge = (
+        '<span class="badge experimental">Experimental</span>' if experimental else ""
+    )
+
+    # Generate icon HTML if available
+    icon_html = ""
+    if p.get("icon_path"):
+        icon_src = html_escape(p["icon_path"])
+        icon_html = f'<img src="{icon_src}" alt="{name} icon" class="plugin-icon">'
+
+    return _CARD_TMPL.format_map(
+        {
+            "icon_html": icon_html,
+            "name": name,
+            "version": version,
+            "category": category,
+            "experimental_badge": experimental_badge,
+            "description": description,
+            "tag_badges": tag_badges,
+            "author": author,
+            "filesize": p["filesize"],
+            "qgis_min": qgis_min,
+            "modified": p["modified"],
+            "filename": html_escape(p["filename"]),
+            "homepage": homepage,
+            "repository": repository,
+            "tracker": tracker,
+        }
+    )
+
+
+def write_index(f, plugins: list):
+    """Write the homepage to an open text file, one plugin card at a time.
 
-    with open(output_file, "w") as f:
-        f.write(html_content)
+    Args:
+        f: Text file opened for writing
+        plugins: Plugin metadata as returned by scan_plugins()
+    """
+    f.write(_INDEX_HEAD_TMPL.substitute(plugin_count=len(plugins)))
+    for p in plugins:
+        f.write(_render_card(p))
+    f.write(_INDEX_TAIL)
 
-    print(f"✅ Generated {output_file} with {len(plugins)} plugins")
 
+def generate_index_html(plugins: list, output_file: str = "index.html"):
+    """Generate a modern HTML homepage for the plugin repository.
 
-def generate_plugins_xml(output_file: str = "plugins.xml"):
-    """Generate plugins.xml for QGIS plugin repository."""
+    Args:
+        plugins: Plugin metadata as returned by scan_plugins()
+        output_file: Path of the HTML file to write
+    """
+    with open(output_file, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+        write_index(f, plugins)
 
-    # Find all plugin zip files in the plugins directory
-    plugins_path = PLUGINS_DIR
-    plugins_data = []
+    print(f"✅ Generated {output_file} with {len(plugins)} plugins")
 
-    if os.path.isdir(plugins_path):
-        for filename in sorted(os.listdir(plugins_path)):
-            if filename.endswith(".zip"):
-                zip_path = os.path.join(plugins_path, filename)
-                metadata = parse_metadata(zip_path)
-                if metadata:
-                    metadata["zip_filename"] = (
-                        filename  # Just the filename for file_name tag
-                    )
-                    metadata["zip_path"] = (
-                        f"{PLUGINS_DIR}/{filename}"  # Full path for download_url
-                    )
-                    plugins_data.append(metadata)
 
-    # Sort plugins alphabetically by name (case-insensitive)
-    plugins_data.sort(key=lambda p: p.get("name", "").lower())
-
-    # Generate XML content
-    xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n<plugins>\n'
-
-    for p in plugins_data:
-        name = p.get("name", "Unknown")
-        version = p.get("version", "0.0.1")
-        description = p.get("description", "No description available.")
-        about = (
-            p.get("about", description)
-            .replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-        )
-        qgis_min = p.get("qgisminimumversion", "3.22")
-        homepage = p.get("homepage", "")
-        author = p.get("author", "Unknown")
-        tracker = p.get("tracker", "")
-        repository = p.get("repository", "")
-        experimental = p.get("experimental", "False")
-        deprecated = p.get("deprecated", "False")
-        tags = p.get("tags", "")
-        category = p.get("category", "Plugins")
-        icon = p.get("icon", "icons/icon.png")
-        zip_filename = p["zip_filename"]  # Just the filename
-        zip_path = p["zip_path"]  # Full path for download URL
-        download_url = f"https://qgis.gishub.org/{zip_path}"
-
-        xml_content += f"""    <pyqgis_plugin name="{name}" version="{version}">
+# Extra entities for xml_escape so values are also safe inside attributes
+_XML_QUOTE = {'"': "&quot;"}
+
+# A single <pyqgis_plugin> entry in plugins.xml
+_XML_PLUGIN_TMPL = """    <pyqgis_plugin name="{name_attr}" version="{version_attr}">
         <description>{description}</description>
         <about>{about}</about>
         <version>{version}</version>
@@ -813,14 +783,137 @@ def generate_plugins_xml(output_file: str = "plugins.xml"):
 
 """
 
-    xml_content += "</plugins>\n"
 
-    with open(output_file, "w") as f:
-        f.write(xml_content)
+def _render_xml_entry(p: dict) -> str:
+    """Render the <pyqgis_plugin> entry for one plugin."""
+    name = p.get("name", "Unknown")
+    version = p.get("version", "0.0.1")
+    description = p.get("description", "No description available.")
+    about = p.get("about", description)
+    qgis_min = p.get("qgisminimumversion", "3.22")
+    homepage = p.get("homepage", "")
+    author = p.get("author", "Unknown")
+    tracker = p.get("tracker", "")
+    repository = p.get("repository", "")
+    experimental = p.get("experimental", "False")
+    deprecated = p.get("deprecated", "False")
+    tags = p.get("tags", "")
+    category = p.get("category", "Plugins")
+    icon = p.get("icon", "icons/icon.png")
+    zip_filename = p["zip_filename"]  # Just the filename
+    zip_path = p["zip_path"]  # Full path for download URL
+    download_url = f"https://qgis.gishub.org/{zip_path}"
+
+    fields = {
+        "name": name,
+        "version": version,
+        "description": description,
+        "about": about,
+        "qgis_min": qgis_min,
+        "homepage": homepage,
+        "zip_filename": zip_filename,
+        "icon": icon,
+        "author": author,
+        "download_url": download_url,
+        "experimental": experimental,
+        "deprecated": deprecated,
+        "tracker": tracker,
+        "repository": repository,
+        "tags": tags,
+        "category": category,
+    }
+    # Escape every field once; name and version are also attribute
+    # values, so those copies need quotes escaped too
+    fields = {key: xml_escape(value) for key, value in fields.items()}
+    fields["name_attr"] = xml_escape(name, _XML_QUOTE)
+    fields["version_attr"] = xml_escape(version, _XML_QUOTE)
+    return _XML_PLUGIN_TMPL.format_map(fields)
+
+
+def write_plugins_xml(f, plugins: list):
+    """Write plugins.xml to an open text file, one plugin entry at a time.
+
+    Args:
+        f: Text file opened for writing
+        plugins: Plugin metadata as returned by scan_plugins()
+    """
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n<plugins>\n')
+    for p in plugins:
+        f.write(_render_xml_entry(p))
+    f.write("</plugins>\n")
+
+
+def generate_plugins_xml(plugins: list, output_file: str = "plugins.xml"):
+    """Generate plugins.xml for QGIS plugin repository.
 
-    print(f"✅ Generated {output_file} with {len(plugins_data)} plugins")
+    Args:
+        plugins: Plugin metadata as returned by scan_plugins()
+        output_file: Path of the XML file to write
+    """
+    with open(output_file, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+        write_plugins_xml(f, plugins)
+
+    print(f"✅ Generated {output_file} with {len(plugins)} plugins")
+
+
+def _fingerprint(entries: list) -> str:
+    """Fingerprint the build inputs: every plugin zip plus this script and template.
+
+    Args:
+        entries: Plugin zips as returned by list_plugin_zips()
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        st = entry.stat()
+        h.update(f"{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    for path in (__file__, os.path.join(TEMPLATES_DIR, "index.html.tmpl")):
+        st = os.stat(path)
+        h.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    return h.hexdigest()
+
+
+def main():
+    """Regenerate plugins.xml, index.html and icons when any plugin zip changed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild even if no plugin zip changed, and re-extract all icons",
+    )
+    args = parser.parse_args()
+
+    entries = list_plugin_zips()
+    fingerprint = _fingerprint(entries)
+    if not args.force and all(
+        os.path.exists(path) for path in ("plugins.xml", "index.html")
+    ):
+        try:
+            with open(BUILD_FINGERPRINT_FILE, "r", encoding="utf-8") as f:
+                unchanged = f.read().strip() == fingerprint
+        except OSError:
+            unchanged = False
+        if unchanged:
+            print("✅ No plugin changes since the last build; nothing to do")
+            return
+
+    load_metadata_cache()
+    load_icon_hashes()
+    plugins = scan_plugins(force=args.force, entries=entries)
+    generate_plugins_xml(plugins)
+    generate_index_html(plugins)
+    # Only keep cache entries for the zips scanned in this run
+    zip_paths = [entry.path for entry in entries]
+    save_metadata_cache(zip_paths=zip_paths)
+    save_icon_hashes(
+        plugin_names=[os.path.basename(path).replace(".zip", "") for path in zip_paths]
+    )
+
+    try:
+        with open(BUILD_FINGERPRINT_FILE, "w", encoding="utf-8") as f:
+            f.write(fingerprint + "\n")
+    except OSError as e:
+        print(f"⚠ Could not write build fingerprint {BUILD_FINGERPRINT_FILE}: {e}")
 
 
 if __name__ == "__main__":
-    generate_plugins_xml()
-    generate_index_html()
+    main()
@@ -6,17 +6,82 @@ This script automatically discovers and installs all plugin .zip files
 from the plugins/ directory to the QGIS plugins folder.
 """
 
+import argparse
+import contextlib
+import functools
+import json
+import mmap
 import os
 import platform
+import queue
 import zipfile
 from pathlib import Path
 import shutil
+import struct
+import subprocess
 import sys
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
+# Resolved once at import; platform.system() can be slow on first call
+_SYSTEM = platform.system()
 
+# Zips larger than this are extracted with several threads
+PARALLEL_EXTRACT_MIN_SIZE = 4 * 1024 * 1024
+
+# Zips larger than this are extracted by a read/inflate/write thread pipeline
+# when no native extractor handled them
+PIPELINE_EXTRACT_MIN_SIZE = 32 * 1024 * 1024
+
+# Zips larger than this are handed to a native extractor when one is available
+FAST_UNZIP_MIN_SIZE = 16 * 1024 * 1024
+
+# Chunk size for copying extracted members to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# os.sendfile can write to regular files only on Linux
+_SENDFILE_TO_FILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+# Characters zipfile replaces in member names on Windows
+_WINDOWS_ILLEGAL_CHARS = str.maketrans(':<>|"?*', "_" * 7)
+
+# Native command for deleting a directory tree, picked once at import;
+# it is much faster than shutil.rmtree on large trees. rd exits with 0 even
+# when it leaves files behind, so only rm's exit status can be trusted.
+if _SYSTEM == "Windows":
+    _RMTREE_COMMAND = ["cmd", "/c", "rd", "/s", "/q"] if shutil.which("cmd") else None
+    _RMTREE_STATUS_RELIABLE = False
+else:
+    _RMTREE_COMMAND = ["rm", "-rf", "--"] if shutil.which("rm") else None
+    _RMTREE_STATUS_RELIABLE = True
+
+# Records which zips are already installed, so unchanged ones are skipped
+INSTALL_MANIFEST_FILE = ".install_manifest.json"
+
+# Prefix for old plugin directories renamed out of the way before deletion
+TRASH_PREFIX = ".qgis_trash_"
+
+# Background deletions of old plugin directories, joined before exit
+_TRASH_THREADS = []
+_TRASH_THREADS_LOCK = threading.Lock()
+
+_PRINT_LOCK = threading.Lock()
+
+
+def _log(*args, **kwargs):
+    """Print from worker threads without interleaving lines."""
+    with _PRINT_LOCK:
+        print(*args, **kwargs)
+
+
+@functools.lru_cache(maxsize=1)
 def get_qgis_plugins_dir():
     """Get the QGIS plugins directory based on the operating system."""
-    system = platform.system()
+    system = _SYSTEM
+    # Resolved here rather than at import: Path.home() raises RuntimeError
+    # for accounts without a home directory, which must not break --help
     home = Path.home()
 
     if system == "Linux":
@@ -44,7 +109,15 @@ def find_plugin_zips(repo_dir):
     if not plugins_dir.exists():
         raise RuntimeError(f"Plugins directory not found: {plugins_dir}")
 
-    zip_files = list(plugins_dir.glob("*.zip"))
+    # Like glob("*.zip"), skip hidden files
+    with os.scandir(plugins_dir) as it:
+        zip_files = [
+            entry.path
+            for entry in it
+            if entry.name.endswith(".zip")
+            and not entry.name.startswith(".")
+            and entry.is_file(follow_symlinks=False)
+        ]
 
     if not zip_files:
         raise RuntimeError(f"No .zip files found in {plugins_dir}")
@@ -52,53 +125,685 @@ def find_plugin_zips(repo_dir):
     return zip_files
 
 
-def install_plugin(zip_path, target_dir):
-    """Install a single plugin from a .zip file."""
-    plugin_name = zip_path.stem
+def _check_inside(path, root):
+    """Refuse a path that is not strictly inside root.
+
+    Raises:
+        ValueError: If path is root itself or lies outside it.
+    """
+    path = os.path.abspath(path)
+    root = os.path.abspath(root)
+    if path == root or os.path.commonpath([path, root]) != root:
+        raise ValueError(f"Refusing to delete {path}: not inside {root}")
+
+
+def _fast_rmtree(path, root):
+    """Remove a directory tree inside root, preferring the platform's native command.
+
+    The path is checked first (see _check_inside), so a wrong path can never
+    reach a recursive delete.
+
+    Falls back to shutil.rmtree when the command is unavailable, cannot be
+    spawned (e.g. in a sandbox), or may have left the tree behind; in the
+    last case shutil.rmtree reports the actual error. A tree that is already
+    gone is not an error, so no existence check is needed up front.
+    """
+    _check_inside(path, root)
+    if _RMTREE_COMMAND is not None:
+        try:
+            result = subprocess.run(
+                [*_RMTREE_COMMAND, str(path)],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            result = None
+        if result is not None and result.returncode == 0 and _RMTREE_STATUS_RELIABLE:
+            return
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        pass
+
+
+def _remove_trash(path, root):
+    """Delete a renamed-away plugin directory, reporting rather than raising errors."""
+    try:
+        _fast_rmtree(path, root)
+    except (OSError, ValueError) as e:
+        _log(f"  ⚠ Could not remove old plugin files {path}: {e}")
+
+
+def _async_rmtree(path, root):
+    """Delete a directory tree in a background thread."""
+    thread = threading.Thread(target=_remove_trash, args=(path, root), daemon=False)
+    thread.start()
+    with _TRASH_THREADS_LOCK:
+        _TRASH_THREADS.append(thread)
+
+
+def _wait_for_trash():
+    """Wait for all background deletions to finish."""
+    with _TRASH_THREADS_LOCK:
+        threads = list(_TRASH_THREADS)
+        _TRASH_THREADS.clear()
+    for thread in threads:
+        thread.join()
+
+
+def _move_aside(final_dir):
+    """Rename an existing plugin directory out of the way.
+
+    Renaming is a single directory-entry update, so the new version can be
+    extracted right away. The caller deletes the old tree in the background
+    once the new one is in place, or renames it back if extraction fails.
+
+    Returns:
+        The trash path the directory was moved to, or None if there was none.
+    """
+    parent, name = os.path.split(final_dir)
+    # A unique name never collides with a leftover trash directory, which
+    # os.replace could not overwrite; any other rename failure propagates
+    trash = os.path.join(parent, f"{TRASH_PREFIX}{uuid.uuid4().hex}_{name}")
+    try:
+        os.replace(final_dir, trash)
+    except FileNotFoundError:
+        # Nothing installed yet
+        return None
+    return trash
+
+
+def _restore_previous(final_dir, trash, target_dir):
+    """Remove a partially extracted plugin and put the previous version back."""
+    try:
+        _fast_rmtree(final_dir, target_dir)
+        if trash is not None:
+            os.replace(trash, final_dir)
+    except (OSError, ValueError) as e:
+        _log(f"  ⚠ Could not restore previous version of {final_dir}: {e}")
+
+
+def _member_parts(filename):
+    """Split a zip member name into path components, sanitized like ZipFile.extract.
+
+    Absolute paths, drive letters, "." and ".." components are dropped, so
+    no component is ever "", "." or "..".
+
+    Returns:
+        The list of components, empty if nothing is left of the name.
+    """
+    arcname = filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [
+        part
+        for part in arcname.split(os.path.sep)
+        if part not in ("", os.path.curdir, os.path.pardir)
+    ]
+    if os.path.sep == "\\":
+        # Filter illegal characters and trailing dots on Windows
+        parts = [part.translate(_WINDOWS_ILLEGAL_CHARS).rstrip(".") for part in parts]
+        parts = [part for part in parts if part]
+    return parts
+
+
+def _member_path(target, filename):
+    """Return the path a zip member extracts to, sanitized like ZipFile.extract.
+
+    Members cannot escape the target directory (see _member_parts).
+
+    Returns:
+        The destination path, or None if nothing is left of the name.
+    """
+    parts = _member_parts(filename)
+    if not parts:
+        return None
+    return os.path.join(target, *parts)
+
+
+def _create_dirs(infos, target):
+    """Create every directory the zip members need, each exactly once.
+
+    Directories are created shallowest first in a single pass, so the file
+    extraction that follows never has to check for or create parents.
+    """
+    dirs = {os.fspath(target)}
+    for info in infos:
+        path = _member_path(target, info.filename)
+        if path is None:
+            continue
+        dirs.add(path if info.is_dir() else os.path.dirname(path))
+    for path in sorted(dirs, key=lambda d: d.count(os.path.sep)):
+        os.makedirs(path, exist_ok=True)
+
+
+def _extract_members(zip_ref, infos, target, check_crc=True):
+    """Extract zip file members, copying file data in large chunks.
+
+    ZipFile.extractall copies with a small default buffer; a 1 MiB buffer
+    cuts the number of read/write calls for large members. Directories must
+    already exist (see _create_dirs).
+
+    With check_crc=False the CRC-32 of the extracted data is neither computed
+    nor compared, which is only safe for zips from a trusted source. This
+    relies on the private ZipExtFile._expected_crc attribute; on a Python
+    without it, CRCs are checked as usual.
+    """
+    for info in infos:
+        if info.is_dir():
+            continue
+        path = _member_path(target, info.filename)
+        if path is None:
+            continue
+        if _SENDFILE_TO_FILE and info.compress_type == zipfile.ZIP_STORED:
+            with open(path, "wb") as dst:
+                if _sendfile_stored(zip_ref, info, dst, check_crc):
+                    continue
+        with zip_ref.open(info) as src, open(path, "wb") as dst:
+            if not check_crc and hasattr(src, "_expected_crc"):
+                # zipfile skips the CRC pass when there is no reference value
+                src._expected_crc = None
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+def _member_data_span(mm, info):
+    """Locate a member's raw (possibly compressed) data in a memory-mapped zip.
+
+    Returns:
+        The (start, end) offsets of the data, taken from the local header.
+    """
+    header = struct.unpack_from(zipfile.structFileHeader, mm, info.header_offset)
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile("Bad magic number for file header")
+    name_length, extra_length = header[-2:]
+    start = info.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+    end = start + info.compress_size
+    if end > len(mm):
+        raise zipfile.BadZipFile(f"Truncated file {info.filename!r}")
+    return start, end
+
+
+def _sendfile_stored(zip_ref, info, dst, check_crc=True):
+    """Copy an uncompressed member straight from the zip file with os.sendfile.
+
+    The data never passes through user space. The member's offset comes from
+    its local header, read out of the memory map without moving the shared
+    file position, so this is safe from several threads.
+
+    Returns:
+        True if the member was written, False if the caller should fall back
+        to a regular copy (dst is left empty in that case).
+    """
+    mm = zip_ref.fp
+    src_fd = getattr(mm, "source_fd", None)
+    if src_fd is None or info.flag_bits & 0x1 or info.file_size == 0:
+        # Not memory-mapped, encrypted, or nothing to copy
+        return False
+
+    offset, end = _member_data_span(mm, info)
+
+    if check_crc:
+        with memoryview(mm) as view, view[offset:end] as data:
+            if zlib.crc32(data) != info.CRC:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+
+    out_fd = dst.fileno()
+    try:
+        while offset < end:
+            sent = os.sendfile(out_fd, src_fd, offset, end - offset)
+            if sent == 0:
+                raise OSError(f"Unexpected end of data for {info.filename!r}")
+            offset += sent
+    except OSError:
+        # Some filesystems do not support sendfile; start the file over
+        dst.seek(0)
+        dst.truncate()
+        return False
+    return True
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only memory map that zipfile can use as a seekable file.
+
+    source_fd keeps the descriptor of the mapped file, for os.sendfile.
+    """
+
+    source_fd = None
+
+    def seekable(self):
+        return True
 
-    print(f"Installing {plugin_name}...")
+    def seek(self, pos, whence=os.SEEK_SET):
+        # zipfile expects OSError for seeks before the start of a short file
+        try:
+            super().seek(pos, whence)
+        except ValueError as e:
+            raise OSError(str(e)) from e
+        return self.tell()
+
+
+@contextlib.contextmanager
+def _open_zip(zip_path):
+    """Open a zip file through a read-only memory map of the whole archive.
+
+    Locating the central directory and reading member headers then works on
+    already-mapped memory instead of issuing many small reads.
+    """
+    with open(zip_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            raise zipfile.BadZipFile("File is not a zip file")
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.source_fd = f.fileno()
+            with zipfile.ZipFile(mm, "r") as zip_ref:
+                yield zip_ref
+
+
+def _parallel_extract(zip_ref, target, infos, workers=None, check_crc=True):
+    """Extract zip members concurrently from a memory-mapped zip.
+
+    Workers share one ZipFile: zipfile serializes the raw reads, which are
+    short copies out of the map, while zlib releases the GIL while inflating,
+    so large archives decompress on several cores at once.
+    """
+    workers = workers or min(os.cpu_count() or 1, 8)
+    files = [info for info in infos if not info.is_dir()]
+
+    def extract_chunk(chunk):
+        _extract_members(zip_ref, chunk, target, check_crc)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Round-robin split so large and small files spread across workers
+        chunks = [files[i::workers] for i in range(workers)]
+        for _ in executor.map(extract_chunk, [c for c in chunks if c]):
+            pass
+
+
+def _pipelined_extract(zip_ref, target, infos, workers=4, check_crc=True):
+    """Extract a memory-mapped zip with a reader -> inflate -> writer pipeline.
+
+    A reader thread locates each member's compressed data in the map,
+    worker threads inflate it (zlib releases the GIL) and a single writer
+    thread writes the chunks as they arrive, keeping one file open per
+    member. Bounded queues between the stages keep memory use flat while
+    disk reads, decompression and disk writes overlap.
+
+    Archives with members that are not stored or deflated, or encrypted,
+    go through _parallel_extract instead.
+    """
+    files = [info for info in infos if not info.is_dir()]
+    mm = zip_ref.fp
+    if not isinstance(mm, mmap.mmap) or any(
+        info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        or info.flag_bits & 0x1
+        for info in files
+    ):
+        _parallel_extract(zip_ref, target, infos, check_crc=check_crc)
+        return
+
+    read_queue = queue.Queue(maxsize=workers * 2)
+    write_queue = queue.Queue(maxsize=workers * 2)
+    errors = []
+
+    def read():
+        try:
+            for index, info in enumerate(files):
+                if errors:
+                    break
+                path = _member_path(target, info.filename)
+                if path is not None:
+                    read_queue.put((index, info, path, _member_data_span(mm, info)))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                read_queue.put(None)
+
+    def inflate():
+        while True:
+            job = read_queue.get()
+            if job is None:
+                write_queue.put(None)
+                return
+            index, info, path, (start, end) = job
+            if errors:
+                continue
+            try:
+                decompressor = (
+                    zlib.decompressobj(-15)
+                    if info.compress_type == zipfile.ZIP_DEFLATED
+                    else None
+                )
+                crc = 0
+                for pos in range(start, end, COPY_BUFFER_SIZE):
+                    # Slicing the map does not move the shared file position
+                    pending = [mm[pos : min(pos + COPY_BUFFER_SIZE, end)]]
+                    while pending:
+                        data = pending.pop()
+                        if decompressor is not None:
+                            data = decompressor.decompress(data, COPY_BUFFER_SIZE)
+                            if decompressor.unconsumed_tail:
+                                pending.append(decompressor.unconsumed_tail)
+                        if check_crc:
+                            crc = zlib.crc32(data, crc)
+                        write_queue.put((index, path, data, False))
+                tail = decompressor.flush() if decompressor is not None else b""
+                if check_crc and zlib.crc32(tail, crc) != info.CRC:
+                    raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+                write_queue.put((index, path, tail, True))
+            except Exception as e:
+                errors.append(e)
+                write_queue.put((index, path, b"", True))
+
+    def write():
+        open_files = {}
+        finished = 0
+        while finished < workers:
+            item = write_queue.get()
+            if item is None:
+                finished += 1
+                continue
+            index, path, data, last = item
+            try:
+                dst = open_files.get(index)
+                if dst is None:
+                    dst = open_files[index] = open(path, "wb")
+                if data:
+                    dst.write(data)
+                if last:
+                    open_files.pop(index).close()
+            except Exception as e:
+                errors.append(e)
+        for dst in open_files.values():
+            dst.close()
+
+    threads = [threading.Thread(target=read), threading.Thread(target=write)]
+    threads += [threading.Thread(target=inflate) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _zip_key(zip_path):
+    """Return a cheap fingerprint of a zip: mtime, size and the sum of member CRCs.
+
+    The CRCs come from the central directory, so nothing is decompressed.
+
+    Returns:
+        A [mtime_ns, size, crc_sum] list, or None if the zip cannot be read.
+    """
+    try:
+        st = os.stat(zip_path)
+        with _open_zip(zip_path) as zip_ref:
+            crc_sum = sum(info.CRC for info in zip_ref.infolist())
+    except (OSError, zipfile.BadZipFile):
+        return None
+    return [st.st_mtime_ns, st.st_size, crc_sum]
 
-    # Create a temporary directory for extraction
-    temp_dir = target_dir / f"_temp_{plugin_name}"
 
+def load_install_manifest(manifest_file):
+    """Load the record of previously installed zips."""
     try:
-        # Extract the zip file
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(temp_dir)
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
 
-        # Find the plugin directory (should be the only subdirectory)
-        subdirs = [d for d in temp_dir.iterdir() if d.is_dir()]
 
-        if len(subdirs) == 1:
-            # Move the plugin directory to the target location
-            plugin_dir = subdirs[0]
-            final_dir = target_dir / plugin_dir.name
+def save_install_manifest(manifest_file, manifest):
+    """Write the install manifest atomically via a temporary file."""
+    tmp_file = f"{manifest_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_file, manifest_file)
+    except OSError as e:
+        print(f"⚠ Could not write install manifest {manifest_file}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+
+
+def _is_installed(entry, key, target_dir):
+    """Check whether a manifest entry shows this exact zip is still installed."""
+    return (
+        isinstance(entry, dict)
+        and entry.get("key") == key
+        and entry.get("target") == target_dir
+        and os.path.isdir(os.path.join(target_dir, entry.get("installed_dir", "")))
+    )
+
+
+def install_plugin(zip_path: str, target_dir: str, trust: bool = False):
+    """Install a single plugin from a .zip file.
+
+    Args:
+        zip_path: The plugin zip to install.
+        target_dir: The QGIS plugins directory.
+        trust: Skip CRC-32 verification of the extracted files.
+
+    Returns:
+        A (plugin_name, ok, error, installed_dir) tuple; error is None on
+        success and installed_dir is None on failure.
+    """
+    plugin_name = os.path.basename(zip_path)[:-4]  # Strip ".zip"
+
+    try:
+        installed_dir = _install_zip(zip_path, plugin_name, target_dir, trust)
+    except Exception as e:
+        return plugin_name, False, str(e), None
+    return plugin_name, True, None, installed_dir
+
+
+@functools.lru_cache(maxsize=None)
+def _tar_reads_zip():
+    """Check whether the system tar is bsdtar, which can extract zip files."""
+    if not shutil.which("tar"):
+        return False
+    try:
+        result = subprocess.run(
+            ["tar", "--version"], capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return False
+    return "bsdtar" in result.stdout
+
+
+def _fast_unzip(zip_path, dest, prefix=None):
+    """Extract a zip with a native tool, which beats zipfile on large archives.
+
+    Tries unzip, then a zip-capable (bsdtar) tar, then PowerShell's
+    Expand-Archive on Windows. All of them refuse member paths that would
+    escape the destination.
+
+    Args:
+        zip_path: The zip file to extract.
+        dest: The directory to extract into; it must exist.
+        prefix: If given, only extract the top-level directory of this name.
+
+    Returns:
+        True if a native tool extracted the archive, False if the caller
+        should fall back to zipfile.
+    """
+    if prefix is not None and any(c in prefix for c in "*?[]\\"):
+        # Would be taken as a wildcard pattern
+        return False
+
+    commands = []
+    if shutil.which("unzip"):
+        commands.append(
+            ["unzip", "-qq", "-o", zip_path, "-d", dest]
+            + ([f"{prefix}/*"] if prefix else [])
+        )
+    if _tar_reads_zip():
+        commands.append(
+            ["tar", "-xf", zip_path, "-C", dest] + ([prefix] if prefix else [])
+        )
+    if _SYSTEM == "Windows" and prefix is None and shutil.which("powershell"):
+
+        def quote(path):
+            return "'" + str(path).replace("'", "''") + "'"
+
+        commands.append(
+            [
+                "powershell",
+                "-NoProfile",
+                "-NonInteractive",
+                "-Command",
+                f"Expand-Archive -LiteralPath {quote(zip_path)} "
+                f"-DestinationPath {quote(dest)} -Force",
+            ]
+        )
+
+    for command in commands:
+        try:
+            result = subprocess.run(
+                [str(arg) for arg in command],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        except OSError:
+            continue
+        if result.returncode == 0:
+            return True
+    return False
+
+
+def _plan_layout(infos, plugin_name):
+    """Decide where a plugin zip installs and which members it extracts.
+
+    Args:
+        infos: The zip's ZipInfo list.
+        plugin_name: The zip's file name without ".zip".
+
+    Returns:
+        An (installed_dir, prefix, infos, native_ok) tuple. prefix is the
+        zip's single top-level directory, or None if everything is extracted
+        into a directory named after the zip. native_ok tells whether native
+        unzip tools can select the same members by raw name.
+    """
+    member_parts = [(info, _member_parts(info.filename)) for info in infos]
+
+    # Find the plugin directory (should be the only top-level directory).
+    # Use the sanitized names, as extracting would, so "./plugin/..." and
+    # "/plugin/..." both count as "plugin"; the checks below are a
+    # safeguard against ever resolving to the plugins directory itself.
+    top_dirs = {
+        parts[0]
+        for info, parts in member_parts
+        if len(parts) > 1 or (parts and info.is_dir())
+    }
+    top_dirs.discard("")
+    top_dirs.discard(os.path.curdir)
+    top_dirs.discard(os.path.pardir)
+
+    if len(top_dirs) != 1:
+        # If there are multiple directories or files at root, extract
+        # everything into a directory named after the zip
+        return plugin_name, None, infos, True
+
+    prefix = next(iter(top_dirs))
+    infos = [info for info, parts in member_parts if parts[:1] == [prefix]]
+    # Native tools select members by raw name, which only works if no name
+    # needed sanitizing
+    native_ok = all(info.filename.startswith(f"{prefix}/") for info in infos)
+    return prefix, prefix, infos, native_ok
+
+
+def _resolve_install_dir(zip_path):
+    """Return the directory name a plugin zip installs to, or None if unreadable."""
+    plugin_name = os.path.basename(zip_path)[:-4]  # Strip ".zip"
+    try:
+        with _open_zip(zip_path) as zip_ref:
+            return _plan_layout(zip_ref.infolist(), plugin_name)[0]
+    except (OSError, zipfile.BadZipFile):
+        return None
 
-            # Remove existing plugin directory if it exists
-            if final_dir.exists():
-                shutil.rmtree(final_dir)
 
-            shutil.move(str(plugin_dir), str(final_dir))
-            print(f"  ✓ {plugin_name} installed successfully")
-        else:
-            # If there are multiple directories or files at root, move everything
-            final_dir = target_dir / plugin_name
+def _install_zip(zip_path, plugin_name, target_dir, trust=False):
+    """Extract a plugin zip into the QGIS plugins directory.
 
-            if final_dir.exists():
-                shutil.rmtree(final_dir)
+    Members are written straight to their final location, without a
+    temporary directory. A zip with a single top-level directory installs
+    under that directory's name, which is the module name QGIS imports.
+    Any other layout installs into a directory named after the zip.
 
-            shutil.move(str(temp_dir), str(final_dir))
-            print(f"  ✓ {plugin_name} installed successfully")
-            temp_dir = None  # Prevent cleanup since we moved the whole directory
+    Returns:
+        The name of the installed plugin directory.
+    """
+    size = os.path.getsize(zip_path)
 
-    finally:
-        # Clean up temporary directory if it still exists
-        if temp_dir and temp_dir.exists():
-            shutil.rmtree(temp_dir)
+    with _open_zip(zip_path) as zip_ref:
+        installed_dir, prefix, infos, native_ok = _plan_layout(
+            zip_ref.infolist(), plugin_name
+        )
+        final_dir = os.path.join(target_dir, installed_dir)
+        # A single plugin directory is extracted straight into the target
+        # location; anything else goes into a directory named after the zip
+        extract_to = target_dir if prefix is not None else final_dir
+
+        # Move the existing plugin directory aside; it is only deleted once
+        # the new version has been extracted completely
+        trash = _move_aside(final_dir)
+        try:
+            _extract_plugin(
+                zip_ref, zip_path, size, infos, extract_to, prefix, native_ok, trust
+            )
+        except BaseException:
+            _restore_previous(final_dir, trash, target_dir)
+            raise
+
+    if trash is not None:
+        _async_rmtree(trash, target_dir)
+    return installed_dir
+
+
+def _extract_plugin(
+    zip_ref, zip_path, size, infos, extract_to, prefix, native_ok, trust
+):
+    """Extract the selected members, choosing the fastest method for the zip size."""
+    if size > FAST_UNZIP_MIN_SIZE and native_ok:
+        os.makedirs(extract_to, exist_ok=True)
+        if _fast_unzip(zip_path, extract_to, prefix):
+            return
+
+    _create_dirs(infos, extract_to)
+
+    if size > PIPELINE_EXTRACT_MIN_SIZE:
+        _pipelined_extract(zip_ref, extract_to, infos, check_crc=not trust)
+    elif size > PARALLEL_EXTRACT_MIN_SIZE:
+        _parallel_extract(zip_ref, extract_to, infos, check_crc=not trust)
+    else:
+        _extract_members(zip_ref, infos, extract_to, check_crc=not trust)
 
 
 def main():
     """Main installation function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="reinstall every plugin, even if its zip is unchanged",
+    )
+    parser.add_argument(
+        "--trust",
+        action="store_true",
+        help=(
+            "skip CRC checks of extracted files, for zips built by this repo; "
+            "applies to the built-in extractor only, zips over "
+            f"{FAST_UNZIP_MIN_SIZE // (1024 * 1024)} MiB handled by a native "
+            "unzip tool are always checked"
+        ),
+    )
+    args = parser.parse_args()
+
     print("QGIS Plugin Installer")
     print("=" * 50)
 
@@ -116,9 +821,22 @@ def main():
     print(f"QGIS plugins directory: {qgis_plugins_dir}")
 
     # Create QGIS plugins directory if it doesn't exist
-    if not qgis_plugins_dir.exists():
-        print(f"Creating QGIS plugins directory: {qgis_plugins_dir}")
-        qgis_plugins_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        qgis_plugins_dir.mkdir(parents=True)
+        print(f"Created QGIS plugins directory: {qgis_plugins_dir}")
+    except FileExistsError:
+        pass
+
+    # Plain string paths from here on; they are joined for every member
+    plugins_dir = str(qgis_plugins_dir)
+
+    # Clean up old plugin directories left behind by an interrupted run
+    with os.scandir(plugins_dir) as it:
+        for entry in it:
+            if entry.name.startswith(TRASH_PREFIX) and entry.is_dir(
+                follow_symlinks=False
+            ):
+                _async_rmtree(entry.path, plugins_dir)
 
     # Find all plugin .zip files
     try:
@@ -127,28 +845,88 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
+    # Skip zips that are installed and unchanged since the last run
+    manifest_file = os.path.join(repo_dir, "plugins", INSTALL_MANIFEST_FILE)
+    manifest = {} if args.force else load_install_manifest(manifest_file)
+    keys = {zip_file: _zip_key(zip_file) for zip_file in plugin_zips}
+    unchanged = [
+        zip_file
+        for zip_file in plugin_zips
+        if keys[zip_file] is not None
+        and _is_installed(manifest.get(zip_file), keys[zip_file], plugins_dir)
+    ]
+    skipped = set(unchanged)
+    plugin_zips = [zip_file for zip_file in plugin_zips if zip_file not in skipped]
+
+    if unchanged:
+        print(f"\nSkipping {len(unchanged)} unchanged plugin(s)")
     print(f"\nFound {len(plugin_zips)} plugin(s) to install:")
     for zip_file in plugin_zips:
-        print(f"  - {zip_file.stem}")
+        print(f"  - {os.path.basename(zip_file)[:-4]}")
 
     print("\nInstalling plugins...")
     print("-" * 50)
 
-    # Install each plugin
-    installed = 0
-    failed = 0
-
+    # Zips that install into the same directory must not replace it
+    # concurrently; each such group is installed in listed order, so the
+    # last zip wins as with a sequential install
+    groups = {}
     for zip_file in plugin_zips:
-        try:
-            install_plugin(zip_file, qgis_plugins_dir)
-            installed += 1
-        except Exception as e:
-            print(f"  ✗ Error installing {zip_file.stem}: {e}")
-            failed += 1
+        installed_dir = _resolve_install_dir(zip_file)
+        # Compare case-insensitively, for case-insensitive filesystems
+        key = installed_dir.lower() if installed_dir is not None else zip_file
+        groups.setdefault(key, []).append(zip_file)
+
+    def install_group(zip_files):
+        return [
+            (zip_file, install_plugin(zip_file, plugins_dir, args.trust))
+            for zip_file in zip_files
+        ]
+
+    # Install the groups concurrently; each one is independent, so
+    # extracting one zip overlaps with the filesystem work of another
+    max_workers = max(1, min(len(groups), os.cpu_count() or 4))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        by_zip = {
+            zip_file: result
+            for group_results in executor.map(install_group, groups.values())
+            for zip_file, result in group_results
+        }
+    results = [by_zip[zip_file] for zip_file in plugin_zips]
+
+    # Report all results in one write, in the order the plugins were listed
+    sys.stdout.write(
+        "".join(
+            (
+                f"  ✓ {name} installed successfully\n"
+                if ok
+                else f"  ✗ Error installing {name}: {err}\n"
+            )
+            for name, ok, err, _ in results
+        )
+    )
+    installed = sum(1 for _, ok, _, _ in results if ok)
+    failed = len(results) - installed
+
+    # Keep entries only for zips that are present and installed
+    new_manifest = {zip_file: manifest[zip_file] for zip_file in unchanged}
+    for zip_file, (_, ok, _, installed_dir) in zip(plugin_zips, results):
+        if ok and keys[zip_file] is not None:
+            new_manifest[zip_file] = {
+                "key": keys[zip_file],
+                "target": plugins_dir,
+                "installed_dir": installed_dir,
+            }
+    save_install_manifest(manifest_file, new_manifest)
+
+    # Let old plugin directories finish deleting before reporting
+    _wait_for_trash()
 
     print("-" * 50)
     print(f"\nInstallation complete!")
     print(f"  Successfully installed: {installed}")
+    if unchanged:
+        print(f"  Unchanged (skipped): {len(unchanged)}")
     if failed > 0:
         print(f"  Failed: {failed}")
 